@@ -28,6 +28,7 @@ SOFTWARE.
 
 from .akinator import Akinator
 from .exceptions import *
+from .utils import use_uvloop
 import os
 
 __version__ = open(os.path.join(os.path.dirname(__file__), "VERSION.txt")).read()
@@ -26,4 +26,4 @@ SOFTWARE.
 """
 
 
-from .async_akinator import Akinator
+from .async_akinator import Akinator, close_shared
@@ -22,17 +22,67 @@ OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
 SOFTWARE.
 """
 
-from ..utils import ans_to_id, get_region, raise_connection_error
-from ..exceptions import CantGoBackAnyFurther
+from ..utils import ANSWER_IDS, INVALID_ANSWER_MESSAGE, get_region, get_backup_region, raise_connection_error
+from ..exceptions import CantGoBackAnyFurther, InvalidAnswerError, AkiNotStarted
 import aiohttp
 import asyncio
 import re
+import yarl
+
+try:
+    from orjson import loads as json_loads
+except ImportError:
+    try:
+        from ujson import loads as json_loads
+    except ImportError:
+        from json import loads as json_loads
 
 #* URLs for the API requests
-NEW_SESSION_URL = "https://{}/ws/new_session?partner=1&player=website-desktop&uid_ext_session={}&frontaddr={}&constraint=ETAT%%3C%%3E%%27AV%%27&constraint=ETAT<>'AV'"
-ANSWER_URL = "https://{}/ws/answer?callback=&session={}&signature={}&step={}&answer={}"
-BACK_URL = "https://{}/ws/answer?callback=&session={}&signature={}&step={}&answer=-1"
-WIN_URL = "https://{}/ws/list?callback=&session={}&signature={}&step={}"
+NEW_SESSION_URL = "https://{}/ws/new_session"
+ANSWER_URL = "https://{}/ws/answer"
+WIN_URL = "https://{}/ws/list"
+
+#* How long to wait for a server to answer the warm-up request, in seconds. It's only a hint, so it shouldn't hold up the game
+WARM_UP_TIMEOUT = 3
+
+#* Regex for getting the uid and frontaddr from akinator.com/game
+INFO_REGEX = re.compile(r"var uid_ext_session = '([^']*)';\n.*var frontaddr = '([^']*)';")
+
+#* Connection pool shared by every Akinator game, along with the event loop it belongs to
+_shared_connector = None
+_shared_loop = None
+
+
+async def _get_shared_connector():
+    """Return the shared connection pool, creating it if it doesn't exist yet for the current event loop
+
+    If the pool was made for a different event loop, it's closed before being replaced so its connections aren't leaked
+    """
+    global _shared_connector, _shared_loop
+
+    loop = asyncio.get_event_loop()
+    if _shared_connector is not None and not _shared_connector.closed and _shared_loop is not loop:
+        try:
+            await _shared_connector.close()
+        except RuntimeError:
+            #* The old event loop is already closed, so its connections can't be shut down cleanly anymore
+            pass
+    if _shared_connector is None or _shared_connector.closed:
+        _shared_connector = aiohttp.TCPConnector(limit=200, limit_per_host=30, ttl_dns_cache=300, keepalive_timeout=75)
+        _shared_loop = loop
+    return _shared_connector
+
+
+async def close_shared():
+    """(coroutine)
+    Close the connection pool shared by all async Akinator games. Call this before each event loop you use Akinator on is closed (for example, at the end of the coroutine you pass to "asyncio.run()")
+    """
+    global _shared_connector, _shared_loop
+
+    if _shared_connector is not None and not _shared_connector.closed:
+        await _shared_connector.close()
+    _shared_connector = None
+    _shared_loop = None
 
 
 class Akinator():
@@ -47,36 +97,123 @@ class Akinator():
         self.uid = None
         self.frontaddr = None
 
+        self._session = None
+        self._answer_url = None
+        self._win_url = None
+        self._win_cache = {}
+
         self.question = None
         self.progression = None
         self.step = None
 
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, exc_type, exc, tb):
+        await self.close()
+
     def _update(self, resp, start=False):
         """Update class variables"""
 
+        #* Any cached guess was for the previous step or game, so it's no longer valid
+        self._win_cache.clear()
+
         if start:
             self.session = int(resp["parameters"]["identification"]["session"])
             self.signature = int(resp["parameters"]["identification"]["signature"])
             self.question = str(resp["parameters"]["step_information"]["question"])
             self.progression = float(resp["parameters"]["step_information"]["progression"])
             self.step = int(resp["parameters"]["step_information"]["step"])
+
+            #* The server, session, and signature stay the same for the whole game, so build these URLs once
+            query = {"callback": "", "session": self.session, "signature": self.signature}
+            self._answer_url = yarl.URL(ANSWER_URL.format(self.server)).with_query(query)
+            self._win_url = yarl.URL(WIN_URL.format(self.server)).with_query(query)
         else:
             self.question = str(resp["parameters"]["question"])
             self.progression = float(resp["parameters"]["progression"])
             self.step = int(resp["parameters"]["step"])
 
+    def _check_started(self):
+        """Raise AkiNotStarted if the game hasn't been started yet or has been closed"""
+
+        if self._session is None or self._session.closed or self._answer_url is None:
+            raise AkiNotStarted("This Akinator game hasn't been started or has been closed. Call \"Akinator.start_game()\" first")
+
+    async def _request(self, url, **kwargs):
+        """Send a GET request to the Akinator API and return the decoded JSON response"""
+
+        async with self._session.get(url, **kwargs) as w:
+            return await w.json(loads=json_loads, content_type=None)
+
     async def _get_session_info(self):
-        """Get uid and frontaddr from akinator.com/game"""
+        """Get uid and frontaddr from akinator.com/game and return them as a tuple"""
+
+        async with self._session.get("https://en.akinator.com/game") as w:
+            match = INFO_REGEX.search(await w.text())
+
+        return match.group(1), match.group(2)
 
-        info_regex = re.compile("var uid_ext_session = '(.*)'\\;\\n.*var frontaddr = '(.*)'\\;")
+    async def _warm_up(self, server):
+        """Open a connection to an Aki server ahead of time so the next request to it can reuse it. Any error, including a timeout, is ignored"""
 
-        async with aiohttp.ClientSession() as session:
-            async with session.get("https://en.akinator.com/game") as w:
-                match = info_regex.search(await w.text())
+        try:
+            async with self._session.head("https://{}/".format(server), timeout=aiohttp.ClientTimeout(total=WARM_UP_TIMEOUT)):
+                pass
+        except (aiohttp.ClientError, asyncio.TimeoutError):
+            pass
 
-        self.uid, self.frontaddr = match.groups()[0], match.groups()[1]
+    async def _new_session(self, server, info):
+        """Start a new session on an Aki server and return a (server, response) tuple
 
-    async def start_game(self, language=None):
+        "info" is the task getting the uid and frontaddr. A connection to the server is warmed up in the background while waiting for it, but the new session is started as soon as "info" is done, whether or not the warm-up has finished
+        """
+        warm_up = asyncio.ensure_future(self._warm_up(server))
+        try:
+            #* Shielded so that cancelling one hedged branch doesn't cancel the task the other branches are waiting on too
+            uid, frontaddr = await asyncio.shield(info)
+        finally:
+            if not warm_up.done():
+                warm_up.cancel()
+
+        params = {
+            "partner": 1,
+            "player": "website-desktop",
+            "uid_ext_session": uid,
+            "frontaddr": frontaddr,
+            "constraint": "ETAT<>'AV'"
+        }
+        return server, await self._request(NEW_SESSION_URL.format(server), params=params)
+
+    async def _hedged_new_session(self, servers, info):
+        """Start a new session on all the servers at once and return the (server, response) tuple of the first one to succeed
+
+        Each server gets its own branch, so a server that's down only holds up its own branch
+        """
+        pending = {asyncio.ensure_future(self._new_session(server, info)) for server in servers}
+        result = None
+        error = None
+        try:
+            while pending:
+                done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+                #* Look at every finished task before returning, so no exception goes unretrieved
+                for task in done:
+                    if task.exception() is not None:
+                        error = task.exception()
+                    elif result is None or result[1]["completion"] != "OK":
+                        result = task.result()
+                if result is not None and result[1]["completion"] == "OK":
+                    return result
+        finally:
+            for task in pending:
+                task.cancel()
+
+        #* None of the servers succeeded, so let start_game raise the appropriate error
+        if result is None:
+            raise error
+        return result
+
+    async def start_game(self, language=None, hedge=False):
         """(coroutine)
         Start an Akinator game. Run this function first before the others. Returns a string containing the first question
 
@@ -99,13 +236,31 @@ class Akinator():
             - "ru": Russian
             - "tr": Turkish
         You can also put the name of the language spelled out, like "spanish", "korean", etc.
-        """
-        self.server = get_region(language)
-        await self._get_session_info()
 
-        async with aiohttp.ClientSession() as session:
-            async with session.get(NEW_SESSION_URL.format(self.server, self.uid, self.frontaddr)) as w:
-                resp = await w.json()
+        If "hedge" is True and the language has a backup server (English and French do), the game is started on both servers at once and the first one to respond successfully is used. This avoids waiting for a timeout when one of them is down or slow, at the cost of an extra request
+        """
+        servers = [get_region(language)]
+        if hedge:
+            backup = get_backup_region(language)
+            if backup is not None:
+                servers.append(backup)
+
+        if self._session is None or self._session.closed:
+            self._session = aiohttp.ClientSession(
+                connector=await _get_shared_connector(),
+                connector_owner=False,
+                timeout=aiohttp.ClientTimeout(total=30)
+            )
+        info = asyncio.ensure_future(self._get_session_info())
+        try:
+            if len(servers) == 1:
+                self.server, resp = await self._new_session(servers[0], info)
+            else:
+                self.server, resp = await self._hedged_new_session(servers, info)
+        finally:
+            if not info.done():
+                info.cancel()
+        self.uid, self.frontaddr = info.result()
 
         if resp["completion"] == "OK":
             self._update(resp, True)
@@ -124,25 +279,19 @@ class Akinator():
             - "probably" OR "p" OR "3" for PROBABLY
             - "probably not" OR "pn" OR "4" for PROBABLY NOT
         """
-        if isinstance(ans, int):
-            if ans >= 0 and ans <= 4:
-                ans = str(ans)
+        self._check_started()
+        try:
+            if isinstance(ans, str):
+                ans = ANSWER_IDS[ans.strip().lower()]
+            #* bool is a subclass of int and True == 1, so it has to be ruled out explicitly
+            elif isinstance(ans, int) and not isinstance(ans, bool):
+                ans = ANSWER_IDS[ans]
             else:
-                raise InvalidAnswerError("""
-                You put "{}", which is an invalid answer.
-                The answer must be one of these:
-                    - "yes" OR "y" OR "0" for YES
-                    - "no" OR "n" OR "1" for NO
-                    - "i" OR "idk" OR "i dont know" OR "i don't know" OR "2" for I DON'T KNOW
-                    - "probably" OR "p" OR "3" for PROBABLY
-                    - "probably not" OR "pn" OR "4" for PROBABLY NOT
-                """.format(ans))
-        else:
-            ans = ans_to_id(ans)
+                raise KeyError(ans)
+        except KeyError:
+            raise InvalidAnswerError(INVALID_ANSWER_MESSAGE.format(ans))
 
-        async with aiohttp.ClientSession() as session:
-            async with session.get(ANSWER_URL.format(self.server, self.session, self.signature, self.step, ans)) as w:
-                resp = await w.json()
+        resp = await self._request(self._answer_url.update_query(step=self.step, answer=ans))
 
         if resp["completion"] == "OK":
             self._update(resp)
@@ -156,12 +305,11 @@ class Akinator():
 
         If you're on the first question and you try to go back again, the CantGoBackAnyFurther exception will be raised
         """
+        self._check_started()
         if self.step == 0:
             raise CantGoBackAnyFurther("You were on the first question and couldn't go back any further")
 
-        async with aiohttp.ClientSession() as session:
-            async with session.get(BACK_URL.format(self.server, self.session, self.signature, self.step)) as w:
-                resp = await w.json()
+        resp = await self._request(self._answer_url.update_query(step=self.step, answer=-1))
 
         if resp["completion"] == "OK":
             self._update(resp)
@@ -181,16 +329,38 @@ class Akinator():
         This function will also return a dictionary containing the above values plus some additional ones.
 
         It's recommended that you call this function when Aki's progression is above 85%. You can get his current progression via "Akinator.progression"
+
+        Calling this function again before answering another question or going back returns the same guess without making another request
         """
-        async with aiohttp.ClientSession() as session:
-            async with session.get(WIN_URL.format(self.server, self.session, self.signature, self.step)) as w:
-                resp = await w.json()
+        self._check_started()
+        if self.step in self._win_cache:
+            return self._win_cache[self.step]
+
+        resp = await self._request(self._win_url.update_query(step=self.step))
 
         if resp["completion"] == "OK":
             guess = resp["parameters"]["elements"][0]["element"]
             self.name = guess["name"]
             self.description = guess["description"]
             self.picture = guess["absolute_picture_path"]
+            self._win_cache[self.step] = guess
             return guess
         else:
             return raise_connection_error(resp["completion"])
+
+    async def close(self):
+        """(coroutine)
+        Close the HTTP session used by this Akinator game. Call this when you're done playing
+
+        This doesn't close the connection pool shared by all the games. Use "akinator.async_aki.close_shared()" for that
+
+        You can also use the class as an async context manager ("async with Akinator() as aki:") and this will be called for you
+
+        After this, calling "Akinator.answer()", "Akinator.back()", or "Akinator.win()" raises AkiNotStarted until "Akinator.start_game()" is called again
+        """
+        if self._session is not None and not self._session.closed:
+            await self._session.close()
+        self._session = None
+        self._answer_url = None
+        self._win_url = None
+        self._win_cache = {}
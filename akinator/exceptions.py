@@ -61,3 +61,8 @@ class AkiTechnicalError(AkiConnectionFailure):
 class CantGoBackAnyFurther(Exception):
     """Raised when the user is on the first question and tries to go back further"""
     pass
+
+
+class AkiNotStarted(Exception):
+    """Raised when the user calls a function that needs a game before calling "Akinator.start_game()" or after closing the game [ASYNC VERSION]"""
+    pass
@@ -23,24 +23,19 @@ SOFTWARE.
 """
 
 from .exceptions import InvalidAnswerError, InvalidLanguageError, AkiConnectionFailure, AkiTimedOut, AkiNoQuestions, AkiServerDown, AkiTechnicalError
+import asyncio
 
 
-def ans_to_id(ans):
-    """Convert an input answer string into an Answer ID for Akinator"""
+#* Maps every accepted answer, including the integers 0-4, to its Answer ID
+ANSWER_IDS = {
+    "yes": "0", "y": "0", "0": "0", 0: "0",
+    "no": "1", "n": "1", "1": "1", 1: "1",
+    "i": "2", "idk": "2", "i dont know": "2", "i don't know": "2", "2": "2", 2: "2",
+    "probably": "3", "p": "3", "3": "3", 3: "3",
+    "probably not": "4", "pn": "4", "4": "4", 4: "4"
+}
 
-    ans = ans.lower()
-    if ans == "yes" or ans == "y" or ans == "0":
-        return "0"
-    elif ans == "no" or ans == "n" or ans == "1":
-        return "1"
-    elif ans == "i" or ans == "idk" or ans == "i dont know" or ans == "i don't know" or ans == "2":
-        return "2"
-    elif ans == "probably" or ans == "p" or ans == "3":
-        return "3"
-    elif ans == "probably not" or ans == "pn" or ans == "4":
-        return "4"
-    else:
-        raise InvalidAnswerError("""
+INVALID_ANSWER_MESSAGE = """
         You put "{}", which is an invalid answer.
         The answer must be one of these:
             - "yes" OR "y" OR "0" for YES
@@ -48,7 +43,16 @@ def ans_to_id(ans):
             - "i" OR "idk" OR "i dont know" OR "i don't know" OR "2" for I DON'T KNOW
             - "probably" OR "p" OR "3" for PROBABLY
             - "probably not" OR "pn" OR "4" for PROBABLY NOT
-        """.format(ans))
+        """
+
+
+def ans_to_id(ans):
+    """Convert an input answer string into an Answer ID for Akinator"""
+
+    try:
+        return ANSWER_IDS[ans.strip().lower()]
+    except KeyError:
+        raise InvalidAnswerError(INVALID_ANSWER_MESSAGE.format(ans))
 
 
 def get_region(lang=None):
@@ -97,6 +101,19 @@ def get_region(lang=None):
             "You put \"{}\", which is an invalid language.".format(lang))
 
 
+def get_backup_region(lang=None):
+    """Returns the backup Aki server for a language, or None if that language doesn't have one"""
+
+    if isinstance(lang, str):
+        lang = lang.lower()
+    if lang is None or lang == "en" or lang == "english":
+        return get_region("en2")
+    elif lang == "fr" or lang == "french":
+        return get_region("fr2")
+    else:
+        return None
+
+
 def raise_connection_error(response):
     """Raise the proper error if the API failed to connect"""
 
@@ -110,3 +127,17 @@ def raise_connection_error(response):
         raise AkiNoQuestions("\"Akinator.step\" reached 80. No more questions")
     else:
         raise AkiConnectionFailure("An unknown error has occured. Server response: {}".format(response))
+
+
+def use_uvloop():
+    """Make asyncio use uvloop's faster event loop, if it's installed. Returns True if it was installed and False otherwise
+
+    This changes the global event loop policy, so call it before creating your event loop
+    """
+    try:
+        import uvloop
+    except ImportError:
+        return False
+
+    asyncio.set_event_loop_policy(uvloop.EventLoopPolicy())
+    return True
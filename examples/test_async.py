@@ -24,6 +24,8 @@ async def main():
         print("Yay\n")
     else:
         print("Oof\n")
+    await aki.close()
+    await akinator.async_aki.close_shared()
 
 
 loop = asyncio.get_event_loop()
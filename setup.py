@@ -6,7 +6,7 @@ DIRECTORY = os.path.dirname(__file__)
 REQUIREMENTS = open(os.path.join(DIRECTORY, "REQUIREMENTS.txt")).read().split()
 EXTRAS = {
     "async": ["aiohttp"],
-    "fast_async": ["aiohttp", "cchardet", "aiodns"]
+    "fast_async": ["aiohttp", "cchardet", "aiodns", "orjson", "uvloop; sys_platform != 'win32'"]
 }
 VERSION = open(os.path.join(DIRECTORY, "akinator", "VERSION.txt")).read()
 READ_ME = open(os.path.join(DIRECTORY, "README.rst")).read()
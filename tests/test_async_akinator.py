@@ -0,0 +1,213 @@
+"""Tests for the async Akinator class. These use a fake HTTP session, so they don't need a network connection"""
+
+from akinator.async_aki import Akinator
+from akinator.exceptions import InvalidAnswerError
+from akinator.utils import get_region, get_backup_region
+import asyncio
+import unittest
+
+SESSION_INFO_PAGE = "<script>\n    var uid_ext_session = 'test-uid';\n    var frontaddr = 'MTI3LjAuMC4x';\n</script>"
+NEW_SESSION_RESPONSE = {
+    "completion": "OK",
+    "parameters": {
+        "identification": {"session": "12", "signature": "123456789"},
+        "step_information": {"question": "Is your character real?", "progression": "0.00000", "step": "0"}
+    }
+}
+ANSWER_RESPONSE = {
+    "completion": "OK",
+    "parameters": {"question": "Is your character a girl?", "progression": "10.00000", "step": "1"}
+}
+LIST_RESPONSE = {
+    "completion": "OK",
+    "parameters": {
+        "elements": [{"element": {"name": "Elon Musk", "description": "Entrepreneur", "absolute_picture_path": "https://example.com/musk.jpg"}}]
+    }
+}
+
+
+class FakeResponse():
+    """Stands in for an aiohttp response"""
+
+    def __init__(self, json=None, text=""):
+        self._json = json
+        self._text = text
+
+    async def json(self, **kwargs):
+        return self._json
+
+    async def text(self):
+        return self._text
+
+
+class FakeRequest():
+    """Stands in for the async context manager returned by aiohttp's ClientSession.get() and .head()"""
+
+    def __init__(self, coro):
+        self._coro = coro
+
+    async def __aenter__(self):
+        return await self._coro
+
+    async def __aexit__(self, exc_type, exc, tb):
+        pass
+
+
+class FakeSession():
+    """Stands in for an aiohttp ClientSession. Servers in "black_holed" accept requests but never reply to them, and if "hanging_head" is True, no HEAD request is ever replied to"""
+
+    def __init__(self, black_holed=(), hanging_head=False):
+        self.black_holed = black_holed
+        self.hanging_head = hanging_head
+        self.closed = False
+        self.requests = []
+
+    def get(self, url, **kwargs):
+        self.requests.append(str(url))
+        return FakeRequest(self._respond(str(url)))
+
+    def head(self, url, **kwargs):
+        return FakeRequest(self._respond(str(url), head=True))
+
+    async def _respond(self, url, head=False):
+        if any(server in url for server in self.black_holed) or (head and self.hanging_head):
+            await asyncio.sleep(3600)
+        if url.endswith("/game"):
+            return FakeResponse(text=SESSION_INFO_PAGE)
+        elif "/ws/new_session" in url:
+            return FakeResponse(json=NEW_SESSION_RESPONSE)
+        elif "/ws/answer" in url:
+            return FakeResponse(json=ANSWER_RESPONSE)
+        elif "/ws/list" in url:
+            return FakeResponse(json=LIST_RESPONSE)
+        return FakeResponse()
+
+    async def close(self):
+        self.closed = True
+
+
+class AsyncTestCase(unittest.TestCase):
+    """Runs each test on its own event loop"""
+
+    def setUp(self):
+        self.loop = asyncio.new_event_loop()
+
+    def tearDown(self):
+        #* Give any cancelled tasks a chance to finish before closing the loop
+        self.loop.run_until_complete(asyncio.sleep(0))
+        self.loop.close()
+
+    def run_coro(self, coro):
+        return self.loop.run_until_complete(asyncio.wait_for(coro, 1))
+
+    def start_game(self):
+        aki = Akinator()
+        aki._session = FakeSession()
+        self.run_coro(aki.start_game())
+        return aki
+
+
+class TestStartGame(AsyncTestCase):
+    def test_hanging_warm_up(self):
+        aki = Akinator()
+        aki._session = FakeSession(hanging_head=True)
+        start = self.loop.time()
+        question = self.run_coro(aki.start_game("en"))
+
+        self.assertEqual(question, "Is your character real?")
+        self.assertLess(self.loop.time() - start, 0.1)
+
+
+class TestHedgedStartGame(AsyncTestCase):
+    def start_game(self, black_holed=(), hanging_head=False):
+        aki = Akinator()
+        aki._session = FakeSession(black_holed, hanging_head)
+        question = self.run_coro(aki.start_game("en", hedge=True))
+        return aki, question
+
+    def test_hanging_warm_up(self):
+        start = self.loop.time()
+        aki, question = self.start_game(hanging_head=True)
+
+        self.assertEqual(question, "Is your character real?")
+        self.assertLess(self.loop.time() - start, 0.1)
+
+    def test_black_holed_backup(self):
+        aki, question = self.start_game([get_backup_region("en")])
+
+        self.assertEqual(question, "Is your character real?")
+        self.assertEqual(aki.server, get_region("en"))
+        self.assertEqual((aki.uid, aki.frontaddr), ("test-uid", "MTI3LjAuMC4x"))
+
+    def test_black_holed_primary(self):
+        aki, question = self.start_game([get_region("en")])
+
+        self.assertEqual(question, "Is your character real?")
+        self.assertEqual(aki.server, get_backup_region("en"))
+
+
+
+class TestAnswer(AsyncTestCase):
+    def answer_id(self, ans):
+        """Answer the first question and return the Answer ID that was sent"""
+
+        aki = self.start_game()
+        self.run_coro(aki.answer(ans))
+        return aki._session.requests[-1].rsplit("answer=", 1)[1]
+
+    def test_valid_answers(self):
+        answers = {
+            "0": [0, "0", "yes", "y", " Yes "],
+            "1": [1, "1", "no", "N"],
+            "2": [2, "2", "i", "idk", "i dont know", "I don't know"],
+            "3": [3, "3", "probably", "p"],
+            "4": [4, "4", "probably not", "PN"]
+        }
+        for answer_id, inputs in answers.items():
+            for ans in inputs:
+                with self.subTest(ans=ans):
+                    self.assertEqual(self.answer_id(ans), answer_id)
+
+    def test_invalid_answers(self):
+        aki = self.start_game()
+        for ans in [5, -1, "maybe", "", True, False, 1.0, None]:
+            with self.subTest(ans=ans):
+                with self.assertRaises(InvalidAnswerError):
+                    self.run_coro(aki.answer(ans))
+        self.assertFalse(any("/ws/answer" in url for url in aki._session.requests))
+
+
+class TestWin(AsyncTestCase):
+    def win_requests(self, aki):
+        """Return how many requests have been sent to the list endpoint"""
+
+        return sum("/ws/list" in url for url in aki._session.requests)
+
+    def test_repeat_win_uses_cache(self):
+        aki = self.start_game()
+        first = self.run_coro(aki.win())
+        second = self.run_coro(aki.win())
+
+        self.assertEqual(first["name"], "Elon Musk")
+        self.assertIs(second, first)
+        self.assertEqual(self.win_requests(aki), 1)
+
+    def test_answer_clears_cache(self):
+        aki = self.start_game()
+        self.run_coro(aki.win())
+        self.run_coro(aki.answer("yes"))
+        self.run_coro(aki.win())
+
+        self.assertEqual(self.win_requests(aki), 2)
+
+    def test_back_clears_cache(self):
+        aki = self.start_game()
+        self.run_coro(aki.answer("yes"))
+        self.run_coro(aki.win())
+        self.run_coro(aki.back())
+        self.run_coro(aki.win())
+
+        self.assertEqual(self.win_requests(aki), 2)
+
+if __name__ == "__main__":
+    unittest.main()